@@ -1,2 +1,3 @@
 from .user import *
-from .item import *
\ No newline at end of file
+from .item import *
+from .job import *
\ No newline at end of file
@@ -1,7 +1,14 @@
+from sqlalchemy import insert, literal, select
+from sqlalchemy.exc import DataError, IntegrityError
 from sqlalchemy.orm import Session
-from ..models.item import Item
+from ..models.item import Item, ItemArchive
 from ..schemas.item import ItemCreate, ItemUpdate
-from typing import List, Optional
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple, Union
+
+def live_items(db: Session):
+    """Query for items that have not been soft-deleted"""
+    return db.query(Item).filter(Item.deleted_at.is_(None))
 
 def create_item(db: Session, item: ItemCreate) -> Item:
     """Create a new item"""
@@ -16,17 +23,27 @@ def create_item(db: Session, item: ItemCreate) -> Item:
     db.refresh(db_item)
     return db_item
 
+def create_items(db: Session, items: List[ItemCreate]) -> List[Item]:
+    """Stage many items in the current transaction; the caller commits"""
+    db_items = [
+        Item(name=item.name, memo=item.memo, quantity=item.quantity, price=item.price)
+        for item in items
+    ]
+    db.add_all(db_items)
+    db.flush()
+    return db_items
+
 def get_item(db: Session, item_id: int) -> Optional[Item]:
     """Get item by ID"""
-    return db.query(Item).filter(Item.id == item_id).first()
+    return live_items(db).filter(Item.id == item_id).first()
 
 def get_items(db: Session, skip: int = 0, limit: int = 100) -> List[Item]:
     """Get all items with pagination"""
-    return db.query(Item).offset(skip).limit(limit).all()
+    return live_items(db).offset(skip).limit(limit).all()
 
 def get_items_by_name(db: Session, name: str, skip: int = 0, limit: int = 100) -> List[Item]:
     """Search items by name"""
-    return db.query(Item).filter(Item.name.ilike(f"%{name}%")).offset(skip).limit(limit).all()
+    return live_items(db).filter(Item.name.ilike(f"%{name}%")).offset(skip).limit(limit).all()
 
 def update_item(db: Session, item_id: int, item_update: ItemUpdate) -> Optional[Item]:
     """Update item"""
@@ -43,16 +60,94 @@ def update_item(db: Session, item_id: int, item_update: ItemUpdate) -> Optional[
     db.refresh(db_item)
     return db_item
 
-def delete_item(db: Session, item_id: int) -> bool:
-    """Delete item"""
-    db_item = get_item(db, item_id)
-    if not db_item:
-        return False
+def _apply_update(db: Session, db_item: Item, update_data: dict):
+    # Savepoint per update so a failing one (e.g. a NOT NULL violation) is
+    # undone without losing the rest of the transaction
+    with db.begin_nested():
+        for field, value in update_data.items():
+            setattr(db_item, field, value)
+
+def update_items(db: Session, updates: List[Tuple[int, dict]]) -> List[Union[Item, None, Exception]]:
+    """Apply updates for many items in a single transaction.
+    
+    `updates` holds one (item_id, update_data) pair per caller, in arrival
+    order. Updates to the same item are merged and written together; if that
+    is rejected (integrity or data error) they are retried one by one so
+    only the offending update fails. Other database errors, such as a lock
+    wait timeout, abort the whole batch.
+    Returns, per caller, the updated Item, None if the item does not exist,
+    or the exception its update raised.
+    """
+    db_items = {
+        db_item.id: db_item
+        for db_item in live_items(db).filter(Item.id.in_({item_id for item_id, _ in updates}))
+    }
+    results: List[Union[Item, None, Exception]] = [None] * len(updates)
+    by_item: Dict[int, List[int]] = {}
+    for index, (item_id, _) in enumerate(updates):
+        by_item.setdefault(item_id, []).append(index)
+    
+    # Ascending id order so concurrent batches lock rows in the same order
+    # and cannot deadlock each other
+    for item_id in sorted(by_item):
+        indexes = by_item[item_id]
+        db_item = db_items.get(item_id)
+        if db_item is None:
+            continue
+        merged = {}
+        for index in indexes:
+            merged.update(updates[index][1])
+        try:
+            _apply_update(db, db_item, merged)
+            for index in indexes:
+                results[index] = db_item
+            continue
+        except (IntegrityError, DataError):
+            pass
+        
+        for index in indexes:
+            try:
+                _apply_update(db, db_item, updates[index][1])
+                results[index] = db_item
+            except (IntegrityError, DataError) as e:
+                results[index] = e
+        # A rolled back savepoint expires the item; reload it for the callers
+        db.refresh(db_item)
     
-    db.delete(db_item)
     db.commit()
-    return True
+    return results
+
+def delete_item(db: Session, item_id: int) -> bool:
+    """Soft-delete item with a single UPDATE"""
+    deleted = live_items(db).filter(Item.id == item_id).update(
+        {Item.deleted_at: datetime.utcnow()}, synchronize_session=False
+    )
+    db.commit()
+    return deleted > 0
 
 def get_low_stock_items(db: Session, threshold: int = 10) -> List[Item]:
     """Get items with low stock"""
-    return db.query(Item).filter(Item.quantity <= threshold).all()
\ No newline at end of file
+    return live_items(db).filter(Item.quantity <= threshold).all()
+
+def archive_deleted_items(db: Session, older_than: timedelta, batch_size: int = 500) -> int:
+    """Move one batch of items soft-deleted before `older_than` ago into items_archive"""
+    cutoff = datetime.utcnow() - older_than
+    item_ids = [
+        row.id for row in db.query(Item.id)
+        .filter(Item.deleted_at.isnot(None), Item.deleted_at < cutoff)
+        .order_by(Item.deleted_at)
+        .limit(batch_size)
+        # Concurrent archivers (one per worker/pod) take disjoint batches
+        .with_for_update(skip_locked=True)
+    ]
+    if not item_ids:
+        return 0
+    
+    columns = [Item.id, Item.name, Item.memo, Item.quantity, Item.price, Item.deleted_at]
+    db.execute(insert(ItemArchive).from_select(
+        [column.key for column in columns] + ["archived_at"],
+        select(*columns, literal(datetime.utcnow(), ItemArchive.archived_at.type)).where(Item.id.in_(item_ids))
+    ))
+    db.query(Item).filter(Item.id.in_(item_ids)).delete(synchronize_session=False)
+    db.commit()
+    return len(item_ids)
\ No newline at end of file
@@ -0,0 +1,112 @@
+from sqlalchemy import and_, or_
+from sqlalchemy.orm import Session
+from ..models.job import Job, JOB_QUEUED, JOB_RUNNING, JOB_SUCCEEDED, JOB_FAILED
+from datetime import datetime, timedelta
+from typing import Any, Optional
+import json
+
+def enqueue_job(db: Session, name: str, payload: Any = None, max_attempts: int = 3) -> Job:
+    """Persist a new job for the background workers"""
+    db_job = Job(
+        name=name,
+        payload=json.dumps(payload),
+        status=JOB_QUEUED,
+        max_attempts=max_attempts
+    )
+    db.add(db_job)
+    db.commit()
+    db.refresh(db_job)
+    return db_job
+
+def get_job(db: Session, job_id: int) -> Optional[Job]:
+    """Get job by ID"""
+    return db.query(Job).filter(Job.id == job_id).first()
+
+def _claimable(now: datetime):
+    # Queued jobs that are due, or running jobs whose worker lease expired
+    # (e.g. the process died mid-job)
+    return or_(
+        and_(Job.status == JOB_QUEUED, Job.run_after <= now),
+        and_(Job.status == JOB_RUNNING, Job.locked_until < now)
+    )
+
+def claim_next_job(db: Session, lease_seconds: int = 300) -> Optional[Job]:
+    """Atomically claim the oldest runnable job, or return None"""
+    now = datetime.utcnow()
+    candidate = db.query(Job.id).filter(_claimable(now)).order_by(Job.id).first()
+    if candidate is None:
+        return None
+    
+    # Conditional UPDATE so that only one worker wins the job, across processes
+    claimed = db.query(Job).filter(Job.id == candidate.id, _claimable(now)).update({
+        Job.status: JOB_RUNNING,
+        Job.attempts: Job.attempts + 1,
+        Job.locked_until: now + timedelta(seconds=lease_seconds),
+        Job.updated_at: now
+    }, synchronize_session=False)
+    db.commit()
+    if not claimed:
+        return None
+    return get_job(db, candidate.id)
+
+def _owned(job_id: int, attempt: int):
+    # The job is still running under the claim made for `attempt`: nobody
+    # reclaimed it after a lease expiry (which would have bumped attempts)
+    return and_(Job.id == job_id, Job.status == JOB_RUNNING, Job.attempts == attempt)
+
+def extend_job_lease(db: Session, job_id: int, attempt: int, lease_seconds: int = 300) -> bool:
+    """Push back the lease of a running job. Returns False if the job is no longer ours."""
+    extended = db.query(Job).filter(_owned(job_id, attempt)).update({
+        Job.locked_until: datetime.utcnow() + timedelta(seconds=lease_seconds)
+    }, synchronize_session=False)
+    db.commit()
+    return extended > 0
+
+def _finish_job(db: Session, job: Job, attempt: int, values: dict) -> Optional[Job]:
+    # Commits together with whatever the handler flushed in this session, or
+    # rolls it all back when the job was reclaimed by another worker
+    finished = db.query(Job).filter(_owned(job.id, attempt)).update(
+        {**values, Job.locked_until: None, Job.updated_at: datetime.utcnow()},
+        synchronize_session=False
+    )
+    if not finished:
+        db.rollback()
+        return None
+    db.commit()
+    db.refresh(job)
+    return job
+
+def complete_job(db: Session, job: Job, attempt: int, result: Any = None) -> Optional[Job]:
+    """Mark job as succeeded and drop its payload, committing the handler's writes with it"""
+    return _finish_job(db, job, attempt, {
+        Job.status: JOB_SUCCEEDED,
+        Job.result: json.dumps(result),
+        Job.error: None,
+        Job.payload: None
+    })
+
+def fail_job(db: Session, job: Job, attempt: int, error: str, retry: bool = True, backoff_seconds: float = 1.0) -> Optional[Job]:
+    """Record a failed attempt, requeueing with exponential backoff while attempts remain"""
+    if retry and attempt < job.max_attempts:
+        values = {
+            Job.status: JOB_QUEUED,
+            Job.run_after: datetime.utcnow() + timedelta(seconds=backoff_seconds * 2 ** (attempt - 1))
+        }
+    else:
+        values = {Job.status: JOB_FAILED, Job.payload: None}
+    return _finish_job(db, job, attempt, {**values, Job.error: error})
+
+
+def purge_finished_jobs(db: Session, older_than: timedelta, batch_size: int = 500) -> int:
+    """Delete one batch of jobs that finished before `older_than` ago"""
+    cutoff = datetime.utcnow() - older_than
+    job_ids = [
+        row.id for row in db.query(Job.id)
+        .filter(Job.status.in_([JOB_SUCCEEDED, JOB_FAILED]), Job.updated_at < cutoff)
+        .limit(batch_size)
+    ]
+    if not job_ids:
+        return 0
+    db.query(Job).filter(Job.id.in_(job_ids)).delete(synchronize_session=False)
+    db.commit()
+    return len(job_ids)
\ No newline at end of file
@@ -32,6 +32,20 @@ def create_user(db: Session, user: UserCreate) -> User:
         db.rollback()
         raise ValueError("Email already exists")
 
+def add_user(db: Session, name: str, email: str, hashed_password: str) -> User:
+    """Stage a user whose password is already hashed; the caller commits"""
+    db_user = User(
+        name=name,
+        email=email,
+        password=hashed_password
+    )
+    try:
+        db.add(db_user)
+        db.flush()
+        return db_user
+    except IntegrityError:
+        raise ValueError("Email already exists")
+
 def get_user(db: Session, user_id: int) -> Optional[User]:
     """Get user by ID"""
     return db.query(User).filter(User.id == user_id).first()
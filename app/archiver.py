@@ -0,0 +1,62 @@
+import logging
+import os
+import threading
+from datetime import timedelta
+from .database import SessionLocal
+from .api import item as crud_item
+
+# Child of uvicorn.error (see app/main.py) so INFO records show up under uvicorn
+logger = logging.getLogger("uvicorn.error.archiver")
+
+# Archiver settings
+ITEM_ARCHIVE_INTERVAL = float(os.getenv("ITEM_ARCHIVE_INTERVAL", "3600"))
+ITEM_ARCHIVE_AFTER_DAYS = float(os.getenv("ITEM_ARCHIVE_AFTER_DAYS", "30"))
+ITEM_ARCHIVE_BATCH_SIZE = int(os.getenv("ITEM_ARCHIVE_BATCH_SIZE", "500"))
+
+def archive_items(session_factory=SessionLocal) -> int:
+    """Archive soft-deleted items batch by batch until none are due. Returns rows moved."""
+    archived = 0
+    db = session_factory()
+    try:
+        while True:
+            moved = crud_item.archive_deleted_items(
+                db,
+                older_than=timedelta(days=ITEM_ARCHIVE_AFTER_DAYS),
+                batch_size=ITEM_ARCHIVE_BATCH_SIZE
+            )
+            archived += moved
+            if moved < ITEM_ARCHIVE_BATCH_SIZE:
+                return archived
+    finally:
+        db.close()
+
+class ItemArchiver:
+    """Thread that periodically moves old soft-deleted items to items_archive"""
+    
+    def __init__(self, interval: float = ITEM_ARCHIVE_INTERVAL, session_factory=SessionLocal):
+        self.interval = interval
+        self.session_factory = session_factory
+        self._thread = None
+        self._stop = threading.Event()
+    
+    def start(self):
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="item-archiver", daemon=True)
+        self._thread.start()
+    
+    def stop(self, timeout: float = 10.0):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+    
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                archived = archive_items(self.session_factory)
+                if archived:
+                    logger.info("Archived %s deleted items", archived)
+            except Exception:
+                logger.exception("Item archiver error")
+
+item_archiver = ItemArchiver()
@@ -1,7 +1,10 @@
 from sqlalchemy import create_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+from collections import deque
 import os
+import threading
+import time
 
 # Database URL
 DATABASE_URL = os.getenv(
@@ -18,10 +21,41 @@ SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 # Create Base class
 Base = declarative_base()
 
+class PoolWaitStats:
+    """How long requests waited to check out a pooled connection, in ms"""
+    
+    def __init__(self, alpha: float = 0.2, window_seconds: float = 60.0, max_samples: int = 1000):
+        self.alpha = alpha
+        self.window_seconds = window_seconds
+        self.ewma = 0.0
+        self._samples = deque(maxlen=max_samples)
+        self._lock = threading.Lock()
+    
+    def record(self, wait_ms: float):
+        with self._lock:
+            self.ewma = wait_ms if not self._samples else self.alpha * wait_ms + (1 - self.alpha) * self.ewma
+            self._samples.append((time.monotonic(), wait_ms))
+    
+    def snapshot(self) -> dict:
+        cutoff = time.monotonic() - self.window_seconds
+        with self._lock:
+            recent = [wait_ms for recorded_at, wait_ms in self._samples if recorded_at >= cutoff]
+            return {
+                "ewma_ms": round(self.ewma, 1),
+                "max_recent_ms": round(max(recent, default=0.0), 1),
+                "recent_requests": len(recent)
+            }
+
+pool_wait = PoolWaitStats()
+
 # Dependency to get DB session
 def get_db():
     db = SessionLocal()
     try:
+        # Check out now so each request's wait for a pooled connection is measured
+        started = time.perf_counter()
+        db.connection()
+        pool_wait.record((time.perf_counter() - started) * 1000)
         yield db
     finally:
         db.close()
\ No newline at end of file
@@ -0,0 +1,127 @@
+import os
+import threading
+import time
+from typing import Optional
+from sqlalchemy import text
+from .database import engine, pool_wait, PoolWaitStats
+
+# Readiness probe settings
+READINESS_CACHE_SECONDS = float(os.getenv("READINESS_CACHE_SECONDS", "2"))
+READINESS_MAX_DB_LATENCY_MS = float(os.getenv("READINESS_MAX_DB_LATENCY_MS", "1000"))
+READINESS_MAX_POOL_WAIT_MS = float(os.getenv("READINESS_MAX_POOL_WAIT_MS", "1000"))
+READINESS_MAX_IN_FLIGHT = int(os.getenv("READINESS_MAX_IN_FLIGHT", "0"))  # 0 = no limit
+
+class RequestCounter:
+    def __init__(self):
+        self.in_flight = 0
+
+request_counter = RequestCounter()
+
+class InFlightMiddleware:
+    """ASGI middleware counting HTTP requests currently being handled"""
+    
+    def __init__(self, app, counter: RequestCounter = request_counter):
+        self.app = app
+        self.counter = counter
+    
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        self.counter.in_flight += 1
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self.counter.in_flight -= 1
+
+def pool_status(bind=engine) -> dict:
+    """Connection pool usage, read from memory without touching the database"""
+    pool = bind.pool
+    status = {}
+    for key, attr in [("size", "size"), ("checked_in", "checkedin"), ("checked_out", "checkedout"), ("overflow", "overflow")]:
+        if hasattr(pool, attr):
+            status[key] = getattr(pool, attr)()
+    # QueuePool only; a negative max_overflow means unbounded
+    max_overflow = getattr(pool, "_max_overflow", -1)
+    if "size" in status and max_overflow >= 0:
+        status["capacity"] = status["size"] + max_overflow
+    return status
+
+class DatabaseProbe:
+    """`SELECT 1` against the pool, cached so probes cost at most one query per `ttl` seconds"""
+    
+    def __init__(self, bind=engine, ttl: float = READINESS_CACHE_SECONDS):
+        self.bind = bind
+        self.ttl = ttl
+        self._result: Optional[dict] = None
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+    
+    def check(self) -> dict:
+        if self._result is not None and time.monotonic() - self._checked_at < self.ttl:
+            return self._result
+        # Only one probe queries at a time; the others reuse the last result
+        if not self._lock.acquire(blocking=self._result is None):
+            return self._result
+        try:
+            if self._result is None or time.monotonic() - self._checked_at >= self.ttl:
+                self._result = self._ping()
+                self._checked_at = time.monotonic()
+            return self._result
+        finally:
+            self._lock.release()
+    
+    def _ping(self) -> dict:
+        started = time.perf_counter()
+        try:
+            with self.bind.connect() as conn:
+                checked_out = time.perf_counter()
+                conn.execute(text("SELECT 1"))
+                finished = time.perf_counter()
+        except Exception as e:
+            return {"status": "error", "error": str(e)}
+        return {
+            "status": "ok",
+            # The probe's own checkout; request checkout waits are in pool_wait
+            "checkout_ms": round((checked_out - started) * 1000, 1),
+            "latency_ms": round((finished - checked_out) * 1000, 1)
+        }
+
+database_probe = DatabaseProbe()
+
+def readiness(
+    probe: Optional[DatabaseProbe] = None,
+    counter: Optional[RequestCounter] = None,
+    exclude_requests: int = 0,
+    wait_stats: Optional[PoolWaitStats] = None
+) -> dict:
+    """Readiness report; `status` is "ready", "overloaded" or "unavailable".
+    
+    `exclude_requests` is subtracted from the in-flight count, for callers
+    that are themselves counted requests. Pool wait is judged on what real
+    requests waited in `get_db`, not on the probe's single checkout.
+    """
+    probe = probe or database_probe
+    counter = counter or request_counter
+    pool = pool_status(probe.bind)
+    waits = (wait_stats or pool_wait).snapshot()
+    in_flight = max(counter.in_flight - exclude_requests, 0)
+    
+    if pool.get("capacity") is not None and pool.get("checked_out", 0) >= pool["capacity"]:
+        # Pool is exhausted: checking out a connection would only block
+        database = {"status": "skipped", "error": "Connection pool exhausted"}
+        status = "overloaded"
+    else:
+        database = probe.check()
+        if database["status"] != "ok":
+            status = "unavailable"
+        elif (
+            database["latency_ms"] > READINESS_MAX_DB_LATENCY_MS
+            or waits["ewma_ms"] > READINESS_MAX_POOL_WAIT_MS
+            or (READINESS_MAX_IN_FLIGHT and in_flight >= READINESS_MAX_IN_FLIGHT)
+        ):
+            status = "overloaded"
+        else:
+            status = "ready"
+    
+    return {"status": status, "database": database, "pool": pool, "pool_wait": waits, "in_flight": in_flight}
@@ -0,0 +1,209 @@
+import json
+import logging
+import os
+import threading
+from datetime import timedelta
+from typing import Callable, Dict, List
+from cryptography.fernet import Fernet, InvalidToken
+from .database import SessionLocal
+from .api import job as crud_job
+from .api import user as crud_user
+from .api import item as crud_item
+from .schemas.item import ItemCreate
+
+# Child of uvicorn.error (see app/main.py) so INFO records show up under uvicorn
+logger = logging.getLogger("uvicorn.error.jobs")
+
+# Worker pool settings
+JOB_WORKERS = int(os.getenv("JOB_WORKERS", "2"))
+JOB_POLL_INTERVAL = float(os.getenv("JOB_POLL_INTERVAL", "1.0"))
+JOB_LEASE_SECONDS = float(os.getenv("JOB_LEASE_SECONDS", "300"))
+JOB_RETRY_BACKOFF = float(os.getenv("JOB_RETRY_BACKOFF", "1.0"))
+# Fernet key for secrets carried in job payloads (passwords awaiting hashing).
+# Without it POST /users/async has to hash before enqueueing.
+JOB_SECRET_KEY = os.getenv("JOB_SECRET_KEY", "")
+payload_cipher = Fernet(JOB_SECRET_KEY) if JOB_SECRET_KEY else None
+# Finished jobs are deleted after this many hours
+JOB_RETENTION_HOURS = float(os.getenv("JOB_RETENTION_HOURS", "168"))
+JOB_PURGE_INTERVAL = float(os.getenv("JOB_PURGE_INTERVAL", "3600"))
+JOB_PURGE_BATCH_SIZE = int(os.getenv("JOB_PURGE_BATCH_SIZE", "500"))
+
+# Registered job handlers: name -> handler(db, payload) -> JSON-serializable result.
+# Handlers must only flush: their writes are committed together with the job
+# completion, so a crash or retry never applies them twice.
+JOB_HANDLERS: Dict[str, Callable] = {}
+
+def job_handler(name: str):
+    """Register a function as the handler for jobs called `name`"""
+    def decorator(func: Callable) -> Callable:
+        JOB_HANDLERS[name] = func
+        return func
+    return decorator
+
+def encrypt_secret(value: str) -> str:
+    """Encrypt a value for a job payload; requires JOB_SECRET_KEY"""
+    return payload_cipher.encrypt(value.encode("utf-8")).decode("ascii")
+
+def decrypt_secret(token: str) -> str:
+    if payload_cipher is None:
+        raise ValueError("JOB_SECRET_KEY is not configured")
+    try:
+        return payload_cipher.decrypt(token.encode("ascii")).decode("utf-8")
+    except InvalidToken:
+        raise ValueError("Cannot decrypt job payload")
+
+@job_handler("create_user")
+def create_user_job(db, payload):
+    # Plaintext never reaches the jobs table: the password arrives either
+    # Fernet-encrypted (and is hashed here, off the request path) or pre-hashed
+    if "encrypted_password" in payload:
+        hashed_password = crud_user.hash_password(decrypt_secret(payload["encrypted_password"]))
+    else:
+        hashed_password = payload["hashed_password"]
+    db_user = crud_user.add_user(db, payload["name"], payload["email"], hashed_password)
+    return {"user_id": db_user.id}
+
+@job_handler("create_items")
+def create_items_job(db, payload):
+    db_items = crud_item.create_items(db, [ItemCreate(**item) for item in payload])
+    return {"item_ids": [db_item.id for db_item in db_items]}
+
+def _keep_lease(job_id: int, attempt: int, session_factory, stop: threading.Event):
+    """Extend a running job's lease until `stop` is set, so long jobs are not reclaimed"""
+    db = session_factory()
+    try:
+        while not stop.wait(JOB_LEASE_SECONDS / 3):
+            try:
+                if not crud_job.extend_job_lease(db, job_id, attempt, lease_seconds=JOB_LEASE_SECONDS):
+                    return
+            except Exception:
+                logger.exception("Could not extend lease of job %s", job_id)
+                db.rollback()
+    finally:
+        db.close()
+
+def purge_jobs(session_factory=SessionLocal) -> int:
+    """Delete finished jobs past their retention, batch by batch. Returns rows deleted."""
+    purged = 0
+    db = session_factory()
+    try:
+        while True:
+            deleted = crud_job.purge_finished_jobs(
+                db,
+                older_than=timedelta(hours=JOB_RETENTION_HOURS),
+                batch_size=JOB_PURGE_BATCH_SIZE
+            )
+            purged += deleted
+            if deleted < JOB_PURGE_BATCH_SIZE:
+                return purged
+    finally:
+        db.close()
+
+def process_next_job(session_factory=SessionLocal) -> bool:
+    """Claim and run one job. Returns False when there was nothing to do."""
+    db = session_factory()
+    try:
+        job = crud_job.claim_next_job(db, lease_seconds=JOB_LEASE_SECONDS)
+        if job is None:
+            return False
+        # Captured now: a rollback below would reload job.attempts from the database
+        attempt = job.attempts
+        
+        handler = JOB_HANDLERS.get(job.name)
+        if handler is None:
+            crud_job.fail_job(db, job, attempt, f"Unknown job: {job.name}", retry=False)
+            return True
+        if attempt > job.max_attempts:
+            # Lease expired on the last attempt, e.g. the worker was killed
+            crud_job.fail_job(db, job, attempt, job.error or "Exceeded max attempts", retry=False)
+            return True
+        
+        stop_heartbeat = threading.Event()
+        heartbeat = threading.Thread(
+            target=_keep_lease,
+            args=(job.id, attempt, session_factory, stop_heartbeat),
+            name=f"job-heartbeat-{job.id}",
+            daemon=True
+        )
+        heartbeat.start()
+        try:
+            try:
+                result = handler(db, json.loads(job.payload))
+            except ValueError as e:
+                # Validation errors (duplicate email, bad payload) will not succeed on retry
+                db.rollback()
+                crud_job.fail_job(db, job, attempt, str(e), retry=False)
+            except Exception as e:
+                logger.exception("Job %s (%s) failed", job.id, job.name)
+                db.rollback()
+                crud_job.fail_job(db, job, attempt, str(e), backoff_seconds=JOB_RETRY_BACKOFF)
+            else:
+                try:
+                    completed = crud_job.complete_job(db, job, attempt, result)
+                except Exception as e:
+                    # The commit of the handler's writes failed; nothing was applied
+                    logger.exception("Job %s (%s) could not be completed", job.id, job.name)
+                    db.rollback()
+                    crud_job.fail_job(db, job, attempt, str(e), backoff_seconds=JOB_RETRY_BACKOFF)
+                else:
+                    if completed is None:
+                        logger.warning("Job %s (%s) lost its lease; its writes were rolled back", job.id, job.name)
+        finally:
+            stop_heartbeat.set()
+            heartbeat.join()
+        return True
+    finally:
+        db.close()
+
+class JobWorkerPool:
+    """Threads that poll the jobs table and run queued jobs"""
+    
+    def __init__(self, workers: int = JOB_WORKERS, session_factory=SessionLocal):
+        self.workers = workers
+        self.session_factory = session_factory
+        self._threads: List[threading.Thread] = []
+        self._stop = threading.Event()
+        self._wakeup = threading.Event()
+    
+    def start(self):
+        self._stop.clear()
+        for i in range(self.workers):
+            thread = threading.Thread(target=self._run, name=f"job-worker-{i}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        purger = threading.Thread(target=self._purge, name="job-purger", daemon=True)
+        purger.start()
+        self._threads.append(purger)
+    
+    def stop(self, timeout: float = 10.0):
+        self._stop.set()
+        self._wakeup.set()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+    
+    def notify(self):
+        """Wake idle workers after a job has been enqueued"""
+        self._wakeup.set()
+    
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                busy = process_next_job(self.session_factory)
+            except Exception:
+                logger.exception("Job worker error")
+                busy = False
+            if not busy:
+                self._wakeup.wait(JOB_POLL_INTERVAL)
+                self._wakeup.clear()
+
+    def _purge(self):
+        while not self._stop.wait(JOB_PURGE_INTERVAL):
+            try:
+                purged = purge_jobs(self.session_factory)
+                if purged:
+                    logger.info("Purged %s finished jobs", purged)
+            except Exception:
+                logger.exception("Job purge error")
+
+worker_pool = JobWorkerPool()
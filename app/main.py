@@ -1,21 +1,90 @@
+import logging
+import time
+
+_started = time.perf_counter()
+
 from fastapi import FastAPI
 from .database import engine
-from .models import User, Item
-from .routers import users, items
+from .models import User, Item, ItemArchive, Job
+from .routers import users, items, jobs, health, debug
+from .jobs import worker_pool
+from .archiver import item_archiver
+from .openapi import install_openapi
+from .health import InFlightMiddleware
+from .profiler import ProfilerMiddleware, PROFILING_ENABLED
+
+# uvicorn configures its own loggers at INFO; app loggers stay at the root's WARNING
+logger = logging.getLogger("uvicorn.error")
+
+# Milliseconds spent in each phase of app construction
+startup_timings = {}
+_last_mark = _started
+
+def _mark(phase: str):
+    global _last_mark
+    now = time.perf_counter()
+    startup_timings[phase] = round((now - _last_mark) * 1000, 1)
+    _last_mark = now
+
+_mark("imports")
 
 # Create tables
 User.metadata.create_all(bind=engine)
 Item.metadata.create_all(bind=engine)
+ItemArchive.metadata.create_all(bind=engine)
+Job.metadata.create_all(bind=engine)
+_mark("create_tables")
 
 app = FastAPI(
     title="User & Item CRUD API",
     description="API for managing users and items",
-    version="1.0.0"
+    version="1.0.0",
+    # Served by install_openapi from a pre-built document
+    openapi_url=None,
+    docs_url=None,
+    redoc_url=None
 )
+app.state.startup_timings = startup_timings
+app.add_middleware(InFlightMiddleware)
+if PROFILING_ENABLED:
+    app.add_middleware(ProfilerMiddleware)
 
 # Include routers
 app.include_router(users.router)
 app.include_router(items.router)
+app.include_router(jobs.router)
+app.include_router(health.router)
+if PROFILING_ENABLED:
+    app.include_router(debug.router)
+openapi_document = install_openapi(app)
+_mark("routes")
+
+@app.on_event("startup")
+def prewarm_openapi():
+    # Build the schema before serving so the first /docs hit is not slow
+    openapi_started = time.perf_counter()
+    openapi_document.warm()
+    startup_timings["openapi"] = round((time.perf_counter() - openapi_started) * 1000, 1)
+    logger.info(
+        "Startup profile (ms): %s",
+        ", ".join(f"{phase}={ms}" for phase, ms in startup_timings.items())
+    )
+
+@app.on_event("startup")
+def start_job_workers():
+    worker_pool.start()
+
+@app.on_event("shutdown")
+def stop_job_workers():
+    worker_pool.stop()
+
+@app.on_event("startup")
+def start_item_archiver():
+    item_archiver.start()
+
+@app.on_event("shutdown")
+def stop_item_archiver():
+    item_archiver.stop()
 
 @app.get("/")
 async def root():
@@ -23,4 +92,5 @@ async def root():
 
 @app.get("/health")
 async def health_check():
+    """Liveness check, kept for existing probes; see /health/live and /health/ready"""
     return {"status": "healthy"}
\ No newline at end of file
@@ -1,2 +1,3 @@
 from .user import User
-from .item import Item
\ No newline at end of file
+from .item import Item, ItemArchive
+from .job import Job
\ No newline at end of file
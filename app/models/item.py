@@ -1,4 +1,5 @@
-from sqlalchemy import Column, Integer, String, Text, Numeric
+from datetime import datetime
+from sqlalchemy import Column, Integer, String, Text, Numeric, DateTime, Index
 from ..database import Base
 
 class Item(Base):
@@ -8,4 +9,23 @@ class Item(Base):
     name = Column(String(100), nullable=False)
     memo = Column(Text, nullable=True)
     quantity = Column(Integer, nullable=False, default=0)
-    price = Column(Numeric(10, 2), nullable=False, default=0.00)
\ No newline at end of file
+    price = Column(Numeric(10, 2), nullable=False, default=0.00)
+    deleted_at = Column(DateTime, nullable=True)
+    
+    __table_args__ = (
+        # Live rows are `deleted_at IS NULL`; leading with deleted_at lets
+        # every read skip soft-deleted rows through the index
+        Index("ix_items_deleted_at_id", "deleted_at", "id"),
+        Index("ix_items_deleted_at_quantity", "deleted_at", "quantity"),
+    )
+
+class ItemArchive(Base):
+    __tablename__ = "items_archive"
+    
+    id = Column(Integer, primary_key=True, autoincrement=False)
+    name = Column(String(100), nullable=False)
+    memo = Column(Text, nullable=True)
+    quantity = Column(Integer, nullable=False)
+    price = Column(Numeric(10, 2), nullable=False)
+    deleted_at = Column(DateTime, nullable=False)
+    archived_at = Column(DateTime, nullable=False, default=datetime.utcnow)
\ No newline at end of file
@@ -0,0 +1,28 @@
+from datetime import datetime
+from sqlalchemy import Column, Integer, String, Text, DateTime
+from sqlalchemy.dialects import mysql
+from ..database import Base
+
+JOB_QUEUED = "queued"
+JOB_RUNNING = "running"
+JOB_SUCCEEDED = "succeeded"
+JOB_FAILED = "failed"
+
+# MySQL TEXT stops at 64 KB, too small for batch import payloads and results
+JobText = Text().with_variant(mysql.LONGTEXT(), "mysql")
+
+class Job(Base):
+    __tablename__ = "jobs"
+    
+    id = Column(Integer, primary_key=True, index=True, autoincrement=True)
+    name = Column(String(100), nullable=False)
+    payload = Column(JobText, nullable=True)
+    status = Column(String(20), nullable=False, default=JOB_QUEUED, index=True)
+    attempts = Column(Integer, nullable=False, default=0)
+    max_attempts = Column(Integer, nullable=False, default=3)
+    result = Column(JobText, nullable=True)
+    error = Column(Text, nullable=True)
+    run_after = Column(DateTime, nullable=False, default=datetime.utcnow)
+    locked_until = Column(DateTime, nullable=True)
+    created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+    updated_at = Column(DateTime, nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow)
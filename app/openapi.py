@@ -0,0 +1,88 @@
+import hashlib
+import json
+from typing import Dict, Tuple
+from fastapi import FastAPI, Request, Response
+from fastapi.openapi.docs import get_redoc_html, get_swagger_ui_html, get_swagger_ui_oauth2_redirect_html
+
+def _root_path(request: Request) -> str:
+    return request.scope.get("root_path", "").rstrip("/")
+
+class OpenAPIDocument:
+    """The app's OpenAPI schema, generated once and served pre-serialized with an ETag.
+    
+    Like FastAPI's own route, a request served under a root_path (uvicorn
+    --root-path, path-prefix proxies) gets that path as the first `servers`
+    entry when app.root_path_in_servers is set; one document is kept per
+    root_path.
+    """
+    
+    def __init__(self, app: FastAPI):
+        self.app = app
+        self._documents: Dict[str, Tuple[bytes, str]] = {}
+    
+    @property
+    def body(self):
+        return self._documents.get("", (None, None))[0]
+    
+    @property
+    def etag(self):
+        return self._documents.get("", (None, None))[1]
+    
+    def warm(self, root_path: str = ""):
+        """Generate and serialize the schema; called at startup"""
+        schema = self.app.openapi()
+        server_urls = {server.get("url") for server in schema.get("servers", [])}
+        if root_path and self.app.root_path_in_servers and root_path not in server_urls:
+            schema = {**schema, "servers": [{"url": root_path}] + schema.get("servers", [])}
+        # Same encoding as FastAPI's JSONResponse
+        body = json.dumps(
+            schema,
+            ensure_ascii=False,
+            allow_nan=False,
+            indent=None,
+            separators=(",", ":")
+        ).encode("utf-8")
+        self._documents[root_path] = (body, '"%s"' % hashlib.sha256(body).hexdigest()[:32])
+    
+    def response(self, request: Request) -> Response:
+        root_path = _root_path(request)
+        if root_path not in self._documents:
+            self.warm(root_path)
+        body, etag = self._documents[root_path]
+        headers = {"ETag": etag, "Cache-Control": "no-cache"}
+        if etag in request.headers.get("if-none-match", ""):
+            return Response(status_code=304, headers=headers)
+        return Response(content=body, media_type="application/json", headers=headers)
+
+def install_openapi(
+    app: FastAPI,
+    openapi_url: str = "/openapi.json",
+    docs_url: str = "/docs",
+    redoc_url: str = "/redoc",
+    oauth2_redirect_url: str = "/docs/oauth2-redirect"
+) -> OpenAPIDocument:
+    """Serve the OpenAPI document and docs pages for an app created with openapi_url=None"""
+    document = OpenAPIDocument(app)
+    
+    @app.get(openapi_url, include_in_schema=False)
+    async def openapi(request: Request):
+        return document.response(request)
+    
+    @app.get(docs_url, include_in_schema=False)
+    async def swagger_ui_html(request: Request):
+        root_path = _root_path(request)
+        return get_swagger_ui_html(
+            openapi_url=root_path + openapi_url,
+            title=app.title + " - Swagger UI",
+            oauth2_redirect_url=root_path + oauth2_redirect_url
+        )
+    
+    @app.get(oauth2_redirect_url, include_in_schema=False)
+    async def swagger_ui_redirect():
+        return get_swagger_ui_oauth2_redirect_html()
+    
+    @app.get(redoc_url, include_in_schema=False)
+    async def redoc_html(request: Request):
+        return get_redoc_html(openapi_url=_root_path(request) + openapi_url, title=app.title + " - ReDoc")
+    
+    return document
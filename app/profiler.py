@@ -0,0 +1,190 @@
+import cProfile
+import hmac
+import io
+import itertools
+import os
+import pstats
+import random
+import time
+from collections import deque
+from contextvars import ContextVar
+from datetime import datetime
+from typing import List, Optional
+from fastapi import Header, HTTPException, status
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+# Profiler settings. Profiling (and the /debug endpoints) only exist when
+# PROFILE_SECRET is set; requests are then profiled when sampled or when they
+# send the secret in the X-Profile header.
+PROFILE_SECRET = os.getenv("PROFILE_SECRET", "")
+PROFILING_ENABLED = bool(PROFILE_SECRET)
+PROFILE_SAMPLE_RATE = float(os.getenv("PROFILE_SAMPLE_RATE", "0"))
+PROFILE_HEADER = b"x-profile"
+PROFILE_BUFFER_SIZE = int(os.getenv("PROFILE_BUFFER_SIZE", "100"))
+PROFILE_TOP_FUNCTIONS = int(os.getenv("PROFILE_TOP_FUNCTIONS", "30"))
+
+# Statements worth an EXPLAIN; both MySQL and SQLite accept these
+EXPLAINABLE = ("select", "update", "delete")
+
+class RequestProfile:
+    """What was recorded for one profiled request.
+    
+    db_ms only counts this request's own statements. total_ms and the cProfile
+    output are taken on the event loop thread, which other requests share:
+    when any other request overlapped this one (`overlapping_requests` > 0)
+    their coroutines show up in python_profile and their time in total_ms,
+    so python_ms is only reported for isolated profiles. Sync (def) routes
+    run in the threadpool, which cProfile does not trace; their SQL is still
+    captured.
+    """
+    _ids = itertools.count(1)
+    
+    def __init__(self, method: str, path: str):
+        self.id = next(self._ids)
+        self.method = method
+        self.path = path
+        self.started_at = datetime.utcnow()
+        self.status_code: Optional[int] = None
+        self.total_ms = 0.0
+        self.db_ms = 0.0
+        self.overlapping_requests = 0
+        self.statements: List[dict] = []
+        self.python_profile: Optional[str] = None
+    
+    def summary(self) -> dict:
+        return {
+            "id": self.id,
+            "method": self.method,
+            "path": self.path,
+            "started_at": self.started_at,
+            "status_code": self.status_code,
+            "total_ms": round(self.total_ms, 2),
+            "db_ms": round(self.db_ms, 2),
+            "python_ms": round(max(self.total_ms - self.db_ms, 0), 2) if self.overlapping_requests == 0 else None,
+            "overlapping_requests": self.overlapping_requests,
+            "statement_count": len(self.statements)
+        }
+    
+    def detail(self) -> dict:
+        return {**self.summary(), "statements": self.statements, "python_profile": self.python_profile}
+
+# Bounded ring buffer of finished profiles, newest last
+profiles = deque(maxlen=PROFILE_BUFFER_SIZE)
+
+_current_profile: ContextVar[Optional[RequestProfile]] = ContextVar("current_profile", default=None)
+# cProfile can only trace one request at a time, so only one is profiled at once
+_active_profile: Optional[RequestProfile] = None
+# Requests currently inside the middleware, to tell whether a profile overlapped others
+_in_flight = 0
+
+def get_profile(profile_id: int) -> Optional[RequestProfile]:
+    for profile in profiles:
+        if profile.id == profile_id:
+            return profile
+    return None
+
+def _is_secret(value: Optional[str]) -> bool:
+    return bool(PROFILE_SECRET) and value is not None and hmac.compare_digest(value, PROFILE_SECRET)
+
+def require_profile_secret(x_profile: Optional[str] = Header(None)):
+    """Dependency guarding the debug endpoints with the X-Profile secret"""
+    if not _is_secret(x_profile):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Invalid profile secret"
+        )
+
+def _should_profile(scope) -> bool:
+    if not PROFILE_SECRET or scope["path"].startswith("/debug/"):
+        return False
+    for name, value in scope.get("headers", []):
+        if name == PROFILE_HEADER and _is_secret(value.decode("latin-1")):
+            return True
+    return PROFILE_SAMPLE_RATE > 0 and random.random() < PROFILE_SAMPLE_RATE
+
+class ProfilerMiddleware:
+    """ASGI middleware profiling sampled requests into the `profiles` ring buffer"""
+    
+    def __init__(self, app):
+        self.app = app
+    
+    async def __call__(self, scope, receive, send):
+        global _active_profile, _in_flight
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        if _active_profile is not None or not _should_profile(scope):
+            if _active_profile is not None:
+                _active_profile.overlapping_requests += 1
+            _in_flight += 1
+            try:
+                await self.app(scope, receive, send)
+            finally:
+                _in_flight -= 1
+            return
+        
+        profile = RequestProfile(scope["method"], scope["path"])
+        profile.overlapping_requests = _in_flight
+        _active_profile = profile
+        _in_flight += 1
+        token = _current_profile.set(profile)
+        
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                profile.status_code = message["status"]
+            await send(message)
+        
+        profiler = cProfile.Profile()
+        started = time.perf_counter()
+        profiler.enable()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            profiler.disable()
+            profile.total_ms = (time.perf_counter() - started) * 1000
+            _current_profile.reset(token)
+            _active_profile = None
+            _in_flight -= 1
+            profile.python_profile = _format_stats(profiler)
+            profiles.append(profile)
+
+def _format_stats(profiler: cProfile.Profile) -> str:
+    output = io.StringIO()
+    pstats.Stats(profiler, stream=output).sort_stats("cumulative").print_stats(PROFILE_TOP_FUNCTIONS)
+    return output.getvalue()
+
+def _explain(conn, statement: str, parameters) -> list:
+    prefix = "EXPLAIN QUERY PLAN " if conn.dialect.name == "sqlite" else "EXPLAIN "
+    # Raw DBAPI cursor so the EXPLAIN is not itself captured
+    cursor = conn.connection.cursor()
+    try:
+        cursor.execute(prefix + statement, parameters)
+        return [list(row) for row in cursor.fetchall()]
+    except Exception as e:
+        return [f"EXPLAIN failed: {e}"]
+    finally:
+        cursor.close()
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _current_profile.get() is not None:
+        conn.info.setdefault("profile_started", []).append(time.perf_counter())
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    profile = _current_profile.get()
+    if profile is None or not conn.info.get("profile_started"):
+        return
+    duration_ms = (time.perf_counter() - conn.info["profile_started"].pop()) * 1000
+    profile.db_ms += duration_ms
+    
+    explain = None
+    if not executemany and statement.lstrip().lower().startswith(EXPLAINABLE):
+        explain = _explain(conn, statement, parameters)
+    # Bound parameter values are left out: they carry emails, password hashes, ...
+    profile.statements.append({
+        "statement": statement,
+        "duration_ms": round(duration_ms, 2),
+        "explain": explain
+    })
@@ -0,0 +1,25 @@
+from fastapi import APIRouter, Depends, HTTPException, status
+from .. import profiler
+
+router = APIRouter(
+    prefix="/debug",
+    tags=["debug"],
+    dependencies=[Depends(profiler.require_profile_secret)],
+    responses={404: {"description": "Not found"}},
+)
+
+@router.get("/profiles")
+async def read_profiles():
+    """List recorded request profiles, newest first"""
+    return [profile.summary() for profile in reversed(profiler.profiles)]
+
+@router.get("/profiles/{profile_id}")
+async def read_profile(profile_id: int):
+    """Get a request profile with its statements, EXPLAIN output and Python profile"""
+    profile = profiler.get_profile(profile_id)
+    if profile is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Profile not found"
+        )
+    return profile.detail()
\ No newline at end of file
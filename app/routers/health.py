@@ -0,0 +1,21 @@
+from fastapi import APIRouter, Response, status
+from .. import health
+
+router = APIRouter(
+    prefix="/health",
+    tags=["health"],
+)
+
+@router.get("/live")
+async def liveness():
+    """Liveness probe: the process is serving requests. Never touches the database."""
+    return {"status": "alive"}
+
+@router.get("/ready")
+def readiness(response: Response):
+    """Readiness probe: database reachable and worker not saturated"""
+    # Don't count this readiness request itself as load
+    report = health.readiness(exclude_requests=1)
+    if report["status"] != "ready":
+        response.status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    return report
\ No newline at end of file
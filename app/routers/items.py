@@ -1,9 +1,14 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Body, Depends, HTTPException, Response, status, Query
+from fastapi.encoders import jsonable_encoder
 from sqlalchemy.orm import Session
 from typing import List, Optional
 from ..database import get_db
-from ..schemas.item import ItemCreate, ItemUpdate, ItemResponse
+from ..schemas.item import ItemCreate, ItemUpdate, ItemResponse, ITEM_BATCH_MAX_SIZE
+from ..schemas.job import JobResponse
 from ..api import item as crud_item
+from ..api import job as crud_job
+from ..jobs import worker_pool
+from ..write_behind import item_update_batcher
 
 router = APIRouter(
     prefix="/items",
@@ -17,6 +22,18 @@ async def create_item(item: ItemCreate, db: Session = Depends(get_db)):
     db_item = crud_item.create_item(db=db, item=item)
     return db_item
 
+@router.post("/batch", response_model=JobResponse, status_code=status.HTTP_202_ACCEPTED)
+async def create_items_batch(
+    response: Response,
+    items: List[ItemCreate] = Body(..., min_length=1, max_length=ITEM_BATCH_MAX_SIZE),
+    db: Session = Depends(get_db)
+):
+    """Queue a batch import of items in the background"""
+    db_job = crud_job.enqueue_job(db, "create_items", jsonable_encoder(items))
+    worker_pool.notify()
+    response.headers["Location"] = f"/jobs/{db_job.id}"
+    return db_job
+
 @router.get("/", response_model=List[ItemResponse])
 async def read_items(
     skip: int = 0, 
@@ -54,7 +71,10 @@ async def read_item(item_id: int, db: Session = Depends(get_db)):
 @router.put("/{item_id}", response_model=ItemResponse)
 async def update_item(item_id: int, item_update: ItemUpdate, db: Session = Depends(get_db)):
     """Update item"""
-    db_item = crud_item.update_item(db=db, item_id=item_id, item_update=item_update)
+    if item_update_batcher.enabled:
+        db_item = await item_update_batcher.submit(item_id, item_update.dict(exclude_unset=True))
+    else:
+        db_item = crud_item.update_item(db=db, item_id=item_id, item_update=item_update)
     if db_item is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -0,0 +1,22 @@
+from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy.orm import Session
+from ..database import get_db
+from ..schemas.job import JobResponse
+from ..api import job as crud_job
+
+router = APIRouter(
+    prefix="/jobs",
+    tags=["jobs"],
+    responses={404: {"description": "Not found"}},
+)
+
+@router.get("/{job_id}", response_model=JobResponse)
+async def read_job(job_id: int, db: Session = Depends(get_db)):
+    """Get background job status"""
+    db_job = crud_job.get_job(db, job_id=job_id)
+    if db_job is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Job not found"
+        )
+    return db_job
\ No newline at end of file
@@ -1,9 +1,14 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Response, status
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
 from typing import List
 from ..database import get_db
 from ..schemas.user import UserCreate, UserUpdate, UserResponse
+from ..schemas.job import JobResponse
 from ..api import user as crud_user
+from ..api import job as crud_job
+from .. import jobs
+from ..jobs import worker_pool
 
 router = APIRouter(
     prefix="/users",
@@ -23,6 +28,23 @@ async def create_user(user: UserCreate, db: Session = Depends(get_db)):
             detail=str(e)
         )
 
+@router.post("/async", response_model=JobResponse, status_code=status.HTTP_202_ACCEPTED)
+async def create_user_async(user: UserCreate, response: Response, db: Session = Depends(get_db)):
+    """Queue user creation in the background; poll the returned job for the result.
+    
+    With JOB_SECRET_KEY set the password is stored Fernet-encrypted and bcrypt
+    runs in the worker. Without it the password is hashed here before
+    enqueueing, so this endpoint is no faster than POST /users/.
+    """
+    if jobs.payload_cipher is not None:
+        secret = {"encrypted_password": jobs.encrypt_secret(user.password)}
+    else:
+        secret = {"hashed_password": await run_in_threadpool(crud_user.hash_password, user.password)}
+    db_job = crud_job.enqueue_job(db, "create_user", {"name": user.name, "email": user.email, **secret})
+    worker_pool.notify()
+    response.headers["Location"] = f"/jobs/{db_job.id}"
+    return db_job
+
 @router.get("/", response_model=List[UserResponse])
 async def read_users(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
     """Get all users with pagination"""
@@ -1,7 +1,9 @@
 from .user import UserBase, UserCreate, UserUpdate, UserResponse, UserInDB
 from .item import ItemBase, ItemCreate, ItemUpdate, ItemResponse
+from .job import JobResponse
 
 __all__ = [
     "UserBase", "UserCreate", "UserUpdate", "UserResponse", "UserInDB",
-    "ItemBase", "ItemCreate", "ItemUpdate", "ItemResponse"
+    "ItemBase", "ItemCreate", "ItemUpdate", "ItemResponse",
+    "JobResponse"
 ]
\ No newline at end of file
@@ -11,6 +11,9 @@ class ItemBase(BaseModel):
 class ItemCreate(ItemBase):
     pass
 
+# Upper bound for POST /items/batch; larger imports must be split
+ITEM_BATCH_MAX_SIZE = 1000
+
 class ItemUpdate(BaseModel):
     name: Optional[str] = None
     memo: Optional[str] = None
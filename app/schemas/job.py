@@ -0,0 +1,25 @@
+from pydantic import BaseModel, field_validator
+from typing import Any, Optional
+from datetime import datetime
+import json
+
+class JobResponse(BaseModel):
+    id: int
+    name: str
+    status: str
+    attempts: int
+    max_attempts: int
+    result: Optional[Any] = None
+    error: Optional[str] = None
+    created_at: datetime
+    updated_at: datetime
+    
+    @field_validator("result", mode="before")
+    @classmethod
+    def decode_result(cls, value):
+        if isinstance(value, str):
+            return json.loads(value)
+        return value
+    
+    class Config:
+        from_attributes = True
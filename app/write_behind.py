@@ -0,0 +1,96 @@
+import asyncio
+import os
+from typing import List, Optional, Tuple
+from sqlalchemy.exc import OperationalError
+from .database import SessionLocal
+from .api import item as crud_item
+
+# Write-behind settings for PUT /items/{id}
+ITEM_UPDATE_BATCHING = os.getenv("ITEM_UPDATE_BATCHING", "0") == "1"
+ITEM_UPDATE_FLUSH_INTERVAL_MS = float(os.getenv("ITEM_UPDATE_FLUSH_INTERVAL_MS", "5"))
+ITEM_UPDATE_FLUSH_SIZE = int(os.getenv("ITEM_UPDATE_FLUSH_SIZE", "100"))
+
+# MySQL "Lock wait timeout exceeded" and "Deadlock found" error codes
+LOCK_CONFLICT_ERRORS = (1205, 1213)
+
+def is_lock_conflict(error: Exception) -> bool:
+    """Whether a database error is a lock wait timeout or deadlock worth retrying"""
+    if not isinstance(error, OperationalError):
+        return False
+    args = getattr(error.orig, "args", ())
+    return bool(args) and args[0] in LOCK_CONFLICT_ERRORS
+
+class ItemUpdateBatcher:
+    """Coalesce item updates per item and commit them in one transaction.
+    
+    Updates are buffered for up to `flush_interval` seconds or until
+    `max_batch_size` updates are pending. Later values win per field, which
+    is the same outcome as applying the requests one after another. Callers
+    are only answered once the batch has been committed. An update the
+    database rejects fails only its own caller. A batch that hits a deadlock
+    or lock wait timeout is retried once; any other failure of the batch is
+    reported to every caller in it.
+    """
+    
+    def __init__(
+        self,
+        enabled: bool = ITEM_UPDATE_BATCHING,
+        flush_interval: float = ITEM_UPDATE_FLUSH_INTERVAL_MS / 1000,
+        max_batch_size: int = ITEM_UPDATE_FLUSH_SIZE,
+        session_factory=SessionLocal
+    ):
+        self.enabled = enabled
+        self.flush_interval = flush_interval
+        self.max_batch_size = max_batch_size
+        self.session_factory = session_factory
+        self._pending: List[Tuple[int, dict, asyncio.Future]] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+    
+    def submit(self, item_id: int, update_data: dict) -> asyncio.Future:
+        """Buffer an update; the future resolves to the Item (or None) after flush"""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((item_id, update_data, future))
+        
+        if len(self._pending) >= self.max_batch_size:
+            self.flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.flush_interval, self.flush)
+        return future
+    
+    def flush(self):
+        """Commit all buffered updates and answer their callers"""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        pending, self._pending = self._pending, []
+        if not pending:
+            return
+        
+        updates = [(item_id, update_data) for item_id, update_data, _ in pending]
+        for attempt in range(2):
+            # Keep loaded values readable after commit so no refresh is needed
+            db = self.session_factory(expire_on_commit=False)
+            try:
+                results = crud_item.update_items(db, updates)
+                break
+            except Exception as e:
+                db.rollback()
+                if attempt == 0 and is_lock_conflict(e):
+                    continue
+                for _, _, future in pending:
+                    if not future.done():
+                        future.set_exception(e)
+                return
+            finally:
+                db.close()
+        
+        for (_, _, future), result in zip(pending, results):
+            if future.done():
+                continue
+            if isinstance(result, Exception):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
+
+item_update_batcher = ItemUpdateBatcher()
@@ -0,0 +1,7 @@
+-- Soft-delete for items (existing MySQL databases only).
+-- create_all() creates new tables such as items_archive and jobs on startup,
+-- but it never alters the existing items table, so run this before deploying.
+ALTER TABLE items
+    ADD COLUMN deleted_at DATETIME NULL,
+    ADD INDEX ix_items_deleted_at_id (deleted_at, id),
+    ADD INDEX ix_items_deleted_at_quantity (deleted_at, quantity);
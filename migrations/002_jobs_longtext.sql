@@ -0,0 +1,5 @@
+-- Widen job payload/result from TEXT (64 KB) to LONGTEXT so large batch
+-- imports fit. Only needed where the jobs table was created before this change.
+ALTER TABLE jobs
+    MODIFY payload LONGTEXT NULL,
+    MODIFY result LONGTEXT NULL;
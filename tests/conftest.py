@@ -0,0 +1,36 @@
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from app.main import app
+from app.database import get_db, Base
+
+@pytest.fixture
+def engine(tmp_path):
+    """Fresh SQLite database with all tables for one test"""
+    engine = create_engine(f"sqlite:///{tmp_path}/test.db", connect_args={"check_same_thread": False})
+    Base.metadata.create_all(bind=engine)
+    yield engine
+    engine.dispose()
+
+@pytest.fixture
+def session_factory(engine):
+    return sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+@pytest.fixture
+def client(session_factory):
+    """TestClient whose get_db uses the test database; restores any previous override"""
+    def override_get_db():
+        try:
+            db = session_factory()
+            yield db
+        finally:
+            db.close()
+    
+    previous = app.dependency_overrides.get(get_db)
+    app.dependency_overrides[get_db] = override_get_db
+    yield TestClient(app)
+    if previous is None:
+        app.dependency_overrides.pop(get_db, None)
+    else:
+        app.dependency_overrides[get_db] = previous
\ No newline at end of file
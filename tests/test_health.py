@@ -0,0 +1,81 @@
+from sqlalchemy import create_engine, event
+from app import database, health
+
+def test_liveness(client):
+    """Test liveness probe"""
+    response = client.get("/health/live")
+    assert response.status_code == 200
+    assert response.json() == {"status": "alive"}
+
+def test_readiness(monkeypatch, client, engine):
+    """Test readiness probe with a reachable database"""
+    monkeypatch.setattr(health, "database_probe", health.DatabaseProbe(bind=engine))
+    response = client.get("/health/ready")
+    assert response.status_code == 200
+    data = response.json()
+    assert data["status"] == "ready"
+    assert data["database"]["status"] == "ok"
+    assert data["in_flight"] == 0
+    assert data["pool"]["checked_out"] == 0
+
+def test_readiness_database_unavailable(monkeypatch, client):
+    """Test readiness probe when the database cannot be reached"""
+    broken_engine = create_engine("sqlite:////nonexistent/dir/test.db")
+    monkeypatch.setattr(health, "database_probe", health.DatabaseProbe(bind=broken_engine))
+    response = client.get("/health/ready")
+    assert response.status_code == 503
+    data = response.json()
+    assert data["status"] == "unavailable"
+    assert data["database"]["status"] == "error"
+
+def test_readiness_probe_is_cached(engine):
+    """Test that repeated probes reuse the cached SELECT 1"""
+    statements = []
+    def count_statement(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+    event.listen(engine, "before_cursor_execute", count_statement)
+    try:
+        probe = health.DatabaseProbe(bind=engine, ttl=60)
+        for _ in range(5):
+            assert health.readiness(probe)["status"] == "ready"
+    finally:
+        event.remove(engine, "before_cursor_execute", count_statement)
+    assert statements == ["SELECT 1"]
+
+def test_readiness_overloaded(monkeypatch, engine):
+    """Test that too many in-flight requests report overloaded"""
+    monkeypatch.setattr(health, "READINESS_MAX_IN_FLIGHT", 2)
+    counter = health.RequestCounter()
+    counter.in_flight = 3
+    report = health.readiness(health.DatabaseProbe(bind=engine), counter)
+    assert report["status"] == "overloaded"
+    assert report["in_flight"] == 3
+def test_pool_wait_stats():
+    """Test that request checkout waits are smoothed and the recent max kept"""
+    stats = health.PoolWaitStats(alpha=0.5)
+    for wait_ms in (10.0, 30.0, 2.0):
+        stats.record(wait_ms)
+    snapshot = stats.snapshot()
+    assert snapshot["ewma_ms"] == 11.0
+    assert snapshot["max_recent_ms"] == 30.0
+    assert snapshot["recent_requests"] == 3
+
+def test_get_db_records_pool_wait(monkeypatch, session_factory):
+    """Test that each request's connection checkout is measured in get_db"""
+    stats = health.PoolWaitStats()
+    monkeypatch.setattr(database, "SessionLocal", session_factory)
+    monkeypatch.setattr(database, "pool_wait", stats)
+    db = database.get_db()
+    next(db)
+    db.close()
+    assert stats.snapshot()["recent_requests"] == 1
+
+def test_readiness_overloaded_by_pool_wait(monkeypatch, engine):
+    """Test that slow request checkouts report overloaded while the probe is fast"""
+    monkeypatch.setattr(health, "READINESS_MAX_POOL_WAIT_MS", 100)
+    stats = health.PoolWaitStats()
+    stats.record(500.0)
+    report = health.readiness(health.DatabaseProbe(bind=engine), wait_stats=stats)
+    assert report["status"] == "overloaded"
+    assert report["pool_wait"]["max_recent_ms"] == 500.0
+    assert report["database"]["checkout_ms"] < 100
@@ -1,9 +1,14 @@
+import logging
+import time
 import pytest
 from fastapi.testclient import TestClient
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 from app.main import app
 from app.database import get_db, Base
+from app.models.item import Item, ItemArchive
+from app.archiver import archive_items, ItemArchiver
+from datetime import datetime, timedelta
 from decimal import Decimal
 
 # Create test database
@@ -25,9 +30,16 @@ client = TestClient(app)
 @pytest.fixture(autouse=True)
 def setup_database():
     """Setup database before each test"""
+    # Other test modules install their own override; make sure ours is active
+    previous = app.dependency_overrides.get(get_db)
+    app.dependency_overrides[get_db] = override_get_db
     Base.metadata.create_all(bind=engine)
     yield
     Base.metadata.drop_all(bind=engine)
+    if previous is None:
+        app.dependency_overrides.pop(get_db, None)
+    else:
+        app.dependency_overrides[get_db] = previous
 
 def test_create_item():
     """Test creating an item"""
@@ -218,6 +230,77 @@ def test_delete_item():
     get_response = client.get(f"/items/{item_id}")
     assert get_response.status_code == 404
 
+def test_delete_item_is_soft():
+    """Test that deleting keeps the row with deleted_at set"""
+    create_response = client.post("/items/", json={"name": "Test Item", "quantity": 1, "price": "1.00"})
+    item_id = create_response.json()["id"]
+    
+    assert client.delete(f"/items/{item_id}").status_code == 204
+    assert client.delete(f"/items/{item_id}").status_code == 404
+    assert client.put(f"/items/{item_id}", json={"quantity": 5}).status_code == 404
+    
+    db = TestingSessionLocal()
+    try:
+        db_item = db.query(Item).filter(Item.id == item_id).first()
+        assert db_item.deleted_at is not None
+    finally:
+        db.close()
+
+def test_deleted_items_hidden_from_lists():
+    """Test that soft-deleted items are excluded from list, search and low-stock"""
+    kept_id = client.post("/items/", json={"name": "Apple Kept", "quantity": 1, "price": "1.00"}).json()["id"]
+    deleted_id = client.post("/items/", json={"name": "Apple Gone", "quantity": 1, "price": "1.00"}).json()["id"]
+    client.delete(f"/items/{deleted_id}")
+    
+    for url in ["/items/", "/items/?name=Apple", "/items/low-stock?threshold=10"]:
+        data = client.get(url).json()
+        assert [item["id"] for item in data] == [kept_id]
+
+def test_archive_deleted_items():
+    """Test that old soft-deleted items are moved to the archive table"""
+    old_id = client.post("/items/", json={"name": "Old", "quantity": 1, "price": "1.00"}).json()["id"]
+    recent_id = client.post("/items/", json={"name": "Recent", "quantity": 1, "price": "1.00"}).json()["id"]
+    live_id = client.post("/items/", json={"name": "Live", "quantity": 1, "price": "1.00"}).json()["id"]
+    client.delete(f"/items/{old_id}")
+    client.delete(f"/items/{recent_id}")
+    
+    db = TestingSessionLocal()
+    try:
+        db.query(Item).filter(Item.id == old_id).update({Item.deleted_at: datetime.utcnow() - timedelta(days=90)})
+        db.commit()
+        
+        assert archive_items(TestingSessionLocal) == 1
+        
+        assert [row.id for row in db.query(Item.id).order_by(Item.id)] == [recent_id, live_id]
+        archived = db.query(ItemArchive).all()
+        assert [row.id for row in archived] == [old_id]
+        assert archived[0].name == "Old"
+        assert archived[0].archived_at is not None
+    finally:
+        db.close()
+
+def test_archiver_logs_under_uvicorn(caplog):
+    """Test that the archiver thread logs through uvicorn's logger"""
+    item_id = client.post("/items/", json={"name": "Logged", "quantity": 1, "price": "1.00"}).json()["id"]
+    client.delete(f"/items/{item_id}")
+    db = TestingSessionLocal()
+    try:
+        db.query(Item).filter(Item.id == item_id).update({Item.deleted_at: datetime.utcnow() - timedelta(days=90)})
+        db.commit()
+    finally:
+        db.close()
+    
+    archiver = ItemArchiver(interval=0.01, session_factory=TestingSessionLocal)
+    with caplog.at_level(logging.INFO, logger="uvicorn.error"):
+        archiver.start()
+        try:
+            deadline = time.monotonic() + 5
+            while "Archived 1 deleted items" not in caplog.text and time.monotonic() < deadline:
+                time.sleep(0.01)
+        finally:
+            archiver.stop()
+    assert "Archived 1 deleted items" in caplog.text
+
 def test_delete_item_not_found():
     """Test deleting non-existent item"""
     response = client.delete("/items/999")
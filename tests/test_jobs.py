@@ -0,0 +1,266 @@
+import json
+import time
+import pytest
+from datetime import datetime, timedelta
+from sqlalchemy.dialects import mysql
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.schema import CreateTable
+from cryptography.fernet import Fernet
+from app import jobs
+from app.api import item as crud_item
+from app.api import job as crud_job
+from app.api.user import verify_password
+from app.jobs import process_next_job
+from app.models.item import Item
+from app.models.job import Job
+from app.schemas.item import ItemCreate, ITEM_BATCH_MAX_SIZE
+from app.models.user import User
+
+@pytest.fixture
+def run_jobs(session_factory):
+    """Drain the job queue synchronously"""
+    def run():
+        while process_next_job(session_factory):
+            pass
+    return run
+
+def test_create_user_async(client, run_jobs):
+    """Test queueing user creation and polling the job"""
+    user_data = {
+        "name": "Async User",
+        "email": "async@example.com",
+        "password": "testpassword"
+    }
+    response = client.post("/users/async", json=user_data)
+    assert response.status_code == 202
+    job = response.json()
+    assert job["status"] == "queued"
+    assert response.headers["Location"] == f"/jobs/{job['id']}"
+    
+    run_jobs()
+    
+    response = client.get(f"/jobs/{job['id']}")
+    assert response.status_code == 200
+    data = response.json()
+    assert data["status"] == "succeeded"
+    assert data["attempts"] == 1
+    
+    user_response = client.get(f"/users/{data['result']['user_id']}")
+    assert user_response.status_code == 200
+    assert user_response.json()["email"] == user_data["email"]
+
+def test_create_user_async_does_not_store_password(client, session_factory, run_jobs):
+    """Test that only the password hash is written to the jobs table"""
+    user_data = {
+        "name": "Async User",
+        "email": "async@example.com",
+        "password": "hunter2"
+    }
+    job_id = client.post("/users/async", json=user_data).json()["id"]
+    
+    db = session_factory()
+    try:
+        payload = db.query(Job).filter(Job.id == job_id).first().payload
+        assert "hunter2" not in payload
+        assert verify_password("hunter2", json.loads(payload)["hashed_password"])
+        
+        run_jobs()
+        
+        db_user = db.query(User).filter(User.email == user_data["email"]).first()
+        assert verify_password("hunter2", db_user.password)
+    finally:
+        db.close()
+
+def test_create_user_async_encrypts_password(monkeypatch, client, session_factory, run_jobs):
+    """Test that with JOB_SECRET_KEY the password is encrypted and hashed by the worker"""
+    monkeypatch.setattr(jobs, "payload_cipher", Fernet(Fernet.generate_key()))
+    user_data = {
+        "name": "Async User",
+        "email": "async@example.com",
+        "password": "hunter2"
+    }
+    job_id = client.post("/users/async", json=user_data).json()["id"]
+    
+    db = session_factory()
+    try:
+        payload = json.loads(db.query(Job).filter(Job.id == job_id).first().payload)
+        assert "hunter2" not in json.dumps(payload)
+        assert "hashed_password" not in payload
+        assert jobs.decrypt_secret(payload["encrypted_password"]) == "hunter2"
+        
+        run_jobs()
+        
+        db.expire_all()
+        assert db.query(Job).filter(Job.id == job_id).first().payload is None
+        db_user = db.query(User).filter(User.email == user_data["email"]).first()
+        assert verify_password("hunter2", db_user.password)
+    finally:
+        db.close()
+
+def test_create_user_async_wrong_key(monkeypatch, client, run_jobs):
+    """Test that a payload encrypted with another key fails without retrying"""
+    monkeypatch.setattr(jobs, "payload_cipher", Fernet(Fernet.generate_key()))
+    job_id = client.post("/users/async", json={"name": "n", "email": "e@x", "password": "p"}).json()["id"]
+    monkeypatch.setattr(jobs, "payload_cipher", Fernet(Fernet.generate_key()))
+    
+    run_jobs()
+    
+    data = client.get(f"/jobs/{job_id}").json()
+    assert data["status"] == "failed"
+    assert data["error"] == "Cannot decrypt job payload"
+
+def test_create_user_async_duplicate_email(client, run_jobs):
+    """Test that validation errors fail the job without retrying"""
+    user_data = {
+        "name": "Test User",
+        "email": "test@example.com",
+        "password": "testpassword"
+    }
+    client.post("/users/", json=user_data)
+    job_id = client.post("/users/async", json=user_data).json()["id"]
+    
+    run_jobs()
+    
+    data = client.get(f"/jobs/{job_id}").json()
+    assert data["status"] == "failed"
+    assert data["attempts"] == 1
+    assert "Email already exists" in data["error"]
+
+def test_create_items_batch(client, run_jobs):
+    """Test queueing a batch item import"""
+    items_data = [
+        {"name": "Batch Item 1", "quantity": 1, "price": "1.00"},
+        {"name": "Batch Item 2", "quantity": 2, "price": "2.00"}
+    ]
+    response = client.post("/items/batch", json=items_data)
+    assert response.status_code == 202
+    job_id = response.json()["id"]
+    
+    run_jobs()
+    
+    data = client.get(f"/jobs/{job_id}").json()
+    assert data["status"] == "succeeded"
+    assert len(data["result"]["item_ids"]) == 2
+    assert len(client.get("/items/").json()) == 2
+
+def enqueue(session_factory, name, payload=None):
+    db = session_factory()
+    try:
+        return crud_job.enqueue_job(db, name, payload).id
+    finally:
+        db.close()
+
+def count_items(session_factory):
+    db = session_factory()
+    try:
+        return db.query(Item).count()
+    finally:
+        db.close()
+
+def test_failed_job_writes_are_rolled_back(monkeypatch, client, session_factory, run_jobs):
+    """Test that a handler failing after staging writes leaves nothing behind"""
+    def stage_then_fail(db, payload):
+        crud_item.create_items(db, [ItemCreate(name="Staged", quantity=1, price="1.00")])
+        raise RuntimeError("boom")
+    monkeypatch.setitem(jobs.JOB_HANDLERS, "stage_then_fail", stage_then_fail)
+    job_id = enqueue(session_factory, "stage_then_fail")
+    
+    run_jobs()
+    
+    data = client.get(f"/jobs/{job_id}").json()
+    assert data["status"] == "queued"
+    assert data["error"] == "boom"
+    assert count_items(session_factory) == 0
+
+def test_reclaimed_job_does_not_commit(monkeypatch, session_factory, run_jobs):
+    """Test that a worker whose job was reclaimed rolls back its writes"""
+    def reclaimed(db, payload):
+        other = session_factory()
+        try:
+            other.query(Job).update({Job.attempts: Job.attempts + 1})
+            other.commit()
+        finally:
+            other.close()
+        crud_item.create_items(db, [ItemCreate(name="Duplicate", quantity=1, price="1.00")])
+        return {}
+    monkeypatch.setitem(jobs.JOB_HANDLERS, "reclaimed", reclaimed)
+    job_id = enqueue(session_factory, "reclaimed")
+    
+    run_jobs()
+    
+    assert count_items(session_factory) == 0
+    db = session_factory()
+    try:
+        assert db.query(Job).filter(Job.id == job_id).first().status == "running"
+    finally:
+        db.close()
+
+def test_lease_is_extended_while_job_runs(monkeypatch, session_factory, run_jobs):
+    """Test that a long-running job is not reclaimed after its initial lease"""
+    monkeypatch.setattr(jobs, "JOB_LEASE_SECONDS", 0.3)
+    reclaimed = []
+    def slow(db, payload):
+        time.sleep(0.6)
+        other = session_factory()
+        try:
+            reclaimed.append(crud_job.claim_next_job(other, lease_seconds=0.3))
+        finally:
+            other.close()
+        return {}
+    monkeypatch.setitem(jobs.JOB_HANDLERS, "slow", slow)
+    enqueue(session_factory, "slow")
+    
+    run_jobs()
+    
+    assert reclaimed == [None]
+
+def test_get_job_not_found(client):
+    """Test getting non-existent job"""
+    response = client.get("/jobs/999")
+    assert response.status_code == 404
+
+def test_create_items_batch_too_large(client):
+    """Test that oversized batch imports are rejected"""
+    items_data = [{"name": f"Item {i}", "quantity": 1, "price": "1.00"} for i in range(ITEM_BATCH_MAX_SIZE + 1)]
+    assert client.post("/items/batch", json=items_data).status_code == 422
+    assert client.post("/items/batch", json=[]).status_code == 422
+
+def test_failed_completion_is_retried(monkeypatch, client, session_factory, run_jobs):
+    """Test that a failing completion commit requeues the job without applying its writes"""
+    def fail_completion(*args, **kwargs):
+        raise OperationalError("UPDATE jobs", {}, Exception("Data too long"))
+    monkeypatch.setattr(crud_job, "complete_job", fail_completion)
+    job_id = client.post("/items/batch", json=[{"name": "Item", "quantity": 1, "price": "1.00"}]).json()["id"]
+    
+    run_jobs()
+    
+    data = client.get(f"/jobs/{job_id}").json()
+    assert data["status"] == "queued"
+    assert "Data too long" in data["error"]
+    assert count_items(session_factory) == 0
+
+def test_purge_finished_jobs(client, session_factory):
+    """Test that only finished jobs past retention are purged"""
+    old_done = enqueue(session_factory, "old_done")
+    recent_done = enqueue(session_factory, "recent_done")
+    old_queued = enqueue(session_factory, "old_queued")
+    db = session_factory()
+    try:
+        old = datetime.utcnow() - timedelta(hours=jobs.JOB_RETENTION_HOURS + 1)
+        db.query(Job).filter(Job.id == old_done).update({Job.status: "succeeded", Job.updated_at: old})
+        db.query(Job).filter(Job.id == recent_done).update({Job.status: "failed"})
+        db.query(Job).filter(Job.id == old_queued).update({Job.updated_at: old})
+        db.commit()
+    finally:
+        db.close()
+    
+    assert jobs.purge_jobs(session_factory) == 1
+    assert client.get(f"/jobs/{old_done}").status_code == 404
+    assert client.get(f"/jobs/{recent_done}").status_code == 200
+    assert client.get(f"/jobs/{old_queued}").status_code == 200
+
+def test_job_text_columns_are_longtext_on_mysql():
+    """Test that payload and result do not use MySQL TEXT (64 KB)"""
+    ddl = str(CreateTable(Job.__table__).compile(dialect=mysql.dialect()))
+    assert "payload LONGTEXT" in ddl
+    assert "result LONGTEXT" in ddl
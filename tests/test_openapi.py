@@ -0,0 +1,53 @@
+import logging
+from fastapi.testclient import TestClient
+from app.main import app, openapi_document, prewarm_openapi
+
+client = TestClient(app)
+
+def test_openapi_schema():
+    """Test the pre-serialized OpenAPI document"""
+    response = client.get("/openapi.json")
+    assert response.status_code == 200
+    assert response.headers["ETag"] == openapi_document.etag
+    data = response.json()
+    assert data["info"]["title"] == app.title
+    assert "/items/{item_id}" in data["paths"]
+    assert "/openapi.json" not in data["paths"]
+
+def test_openapi_schema_not_modified():
+    """Test conditional requests with If-None-Match"""
+    etag = client.get("/openapi.json").headers["ETag"]
+    response = client.get("/openapi.json", headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.content == b""
+
+def test_docs_pages():
+    """Test that the docs pages point at the OpenAPI document"""
+    for url in ["/docs", "/redoc"]:
+        response = client.get(url)
+        assert response.status_code == 200
+        assert "/openapi.json" in response.text
+
+def test_openapi_behind_root_path():
+    """Test docs and document served under a path prefix, like FastAPI's own routes"""
+    prefixed_client = TestClient(app, root_path="/api")
+    response = prefixed_client.get("/openapi.json")
+    assert response.status_code == 200
+    assert response.json()["servers"][0] == {"url": "/api"}
+    assert response.headers["ETag"] != openapi_document.etag
+    
+    for url in ["/docs", "/redoc"]:
+        assert "/api/openapi.json" in prefixed_client.get(url).text
+    assert "/api/docs/oauth2-redirect" in prefixed_client.get("/docs").text
+    
+    assert "servers" not in client.get("/openapi.json").json()
+
+def test_startup_prewarms_openapi(monkeypatch, caplog):
+    """Test that the startup hook builds the document and reports timings"""
+    monkeypatch.setattr(openapi_document, "_documents", {})
+    with caplog.at_level(logging.INFO, logger="uvicorn.error"):
+        prewarm_openapi()
+    assert openapi_document.body is not None
+    assert "openapi" in app.state.startup_timings
+    assert "create_tables" in app.state.startup_timings
+    assert "Startup profile (ms): imports=" in caplog.text
\ No newline at end of file
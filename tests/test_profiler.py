@@ -0,0 +1,125 @@
+import asyncio
+import threading
+import time
+import pytest
+from collections import deque
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from app import profiler
+from app.database import get_db
+from app.routers import items, debug
+
+SECRET = "test-secret"
+
+@pytest.fixture
+def profiled_client(monkeypatch, session_factory):
+    """Client for an app with profiling enabled, as app.main builds it when PROFILE_SECRET is set"""
+    monkeypatch.setattr(profiler, "profiles", deque(maxlen=2))
+    monkeypatch.setattr(profiler, "PROFILE_SECRET", SECRET)
+    
+    def override_get_db():
+        try:
+            db = session_factory()
+            yield db
+        finally:
+            db.close()
+    
+    profiled_app = FastAPI()
+    profiled_app.add_middleware(profiler.ProfilerMiddleware)
+    profiled_app.include_router(items.router)
+    profiled_app.include_router(debug.router)
+    profiled_app.dependency_overrides[get_db] = override_get_db
+    return TestClient(profiled_app, headers={"X-Profile": SECRET})
+
+def test_debug_endpoints_not_mounted_by_default(client):
+    """Test that the main app has no /debug routes without PROFILE_SECRET"""
+    response = client.get("/debug/profiles", headers={"X-Profile": SECRET})
+    assert response.status_code == 404
+
+def test_debug_endpoints_require_secret(profiled_client):
+    """Test that the profile list needs the shared secret"""
+    assert profiled_client.get("/debug/profiles", headers={"X-Profile": "wrong"}).status_code == 403
+    assert profiled_client.get("/debug/profiles", headers={"X-Profile": ""}).status_code == 403
+
+def test_profile_request_by_header(profiled_client):
+    """Test profiling a request with the X-Profile header"""
+    profiled_client.post("/items/", json={"name": "Item", "quantity": 1, "price": "1.00"}, headers={"X-Profile": "0"})
+    response = profiled_client.get("/items/low-stock")
+    assert response.status_code == 200
+    
+    summaries = profiled_client.get("/debug/profiles").json()
+    assert len(summaries) == 1
+    summary = summaries[0]
+    assert summary["path"] == "/items/low-stock"
+    assert summary["status_code"] == 200
+    assert summary["statement_count"] == 1
+    assert summary["total_ms"] >= summary["db_ms"]
+    
+    detail = profiled_client.get(f"/debug/profiles/{summary['id']}").json()
+    statement = detail["statements"][0]
+    assert statement["statement"].startswith("SELECT")
+    assert statement["explain"]
+    assert "get_low_stock_items" in detail["python_profile"]
+
+def test_profile_omits_parameters(profiled_client):
+    """Test that bound parameter values are not stored"""
+    profiled_client.post("/items/", json={"name": "Secret Name", "quantity": 1, "price": "1.00"})
+    summary = profiled_client.get("/debug/profiles").json()[0]
+    detail = profiled_client.get(f"/debug/profiles/{summary['id']}")
+    assert "INSERT" in detail.text
+    assert "Secret Name" not in detail.text
+
+def test_wrong_header_is_not_profiled(profiled_client):
+    """Test that requests without the right secret are not profiled when sampling is off"""
+    profiled_client.get("/items/", headers={"X-Profile": "0"})
+    profiled_client.get("/items/", headers={"X-Profile": "wrong"})
+    assert profiler.profiles == deque([], maxlen=2)
+
+def test_sampled_requests(monkeypatch, profiled_client):
+    """Test profiling by sample rate"""
+    monkeypatch.setattr(profiler, "PROFILE_SAMPLE_RATE", 1.0)
+    profiled_client.get("/items/", headers={"X-Profile": "0"})
+    assert len(profiler.profiles) == 1
+
+def test_profile_buffer_is_bounded(profiled_client):
+    """Test that only the newest profiles are kept"""
+    for _ in range(3):
+        profiled_client.get("/items/")
+    summaries = profiled_client.get("/debug/profiles").json()
+    assert len(summaries) == 2
+    assert summaries[0]["id"] > summaries[1]["id"]
+
+def test_profile_not_found(profiled_client):
+    """Test getting non-existent profile"""
+    response = profiled_client.get("/debug/profiles/999999")
+    assert response.status_code == 404
+
+def test_debug_requests_are_not_profiled(profiled_client):
+    """Test that reading profiles does not fill the buffer"""
+    profiled_client.get("/debug/profiles")
+    assert len(profiler.profiles) == 0
+
+
+def test_overlapping_requests_hide_python_ms(profiled_client):
+    """Test that a profile overlapping another request reports it and drops python_ms"""
+    @profiled_client.app.get("/slow")
+    async def slow():
+        await asyncio.sleep(0.3)
+        return {}
+    
+    profiled_client.get("/items/")
+    summary = profiled_client.get("/debug/profiles").json()[0]
+    assert summary["overlapping_requests"] == 0
+    assert summary["python_ms"] is not None
+    
+    # TestClient runs each request on its own event loop thread, so these overlap
+    profiled = threading.Thread(target=profiled_client.get, args=("/slow",))
+    profiled.start()
+    time.sleep(0.1)
+    profiled_client.get("/items/", headers={"X-Profile": "0"})
+    profiled.join()
+    
+    summary = profiled_client.get("/debug/profiles").json()[0]
+    assert summary["path"] == "/slow"
+    assert summary["overlapping_requests"] == 1
+    assert summary["python_ms"] is None
@@ -24,9 +24,16 @@ client = TestClient(app)
 @pytest.fixture(autouse=True)
 def setup_database():
     """Setup database before each test"""
+    # Other test modules install their own override; make sure ours is active
+    previous = app.dependency_overrides.get(get_db)
+    app.dependency_overrides[get_db] = override_get_db
     Base.metadata.create_all(bind=engine)
     yield
     Base.metadata.drop_all(bind=engine)
+    if previous is None:
+        app.dependency_overrides.pop(get_db, None)
+    else:
+        app.dependency_overrides[get_db] = previous
 
 def test_create_user():
     """Test creating a user"""
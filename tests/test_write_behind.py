@@ -0,0 +1,142 @@
+import asyncio
+import pytest
+from sqlalchemy import event
+from sqlalchemy.exc import IntegrityError, OperationalError
+from app.api import item as crud_item
+from app.write_behind import ItemUpdateBatcher, item_update_batcher
+
+@pytest.fixture
+def create_item(client):
+    def create(name, quantity):
+        response = client.post("/items/", json={"name": name, "quantity": quantity, "price": "1.00"})
+        return response.json()["id"]
+    return create
+
+def test_updates_are_merged_into_one_commit(client, engine, session_factory, create_item):
+    """Test that concurrent updates are coalesced per item and committed once"""
+    first_id = create_item("First", 10)
+    second_id = create_item("Second", 20)
+    batcher = ItemUpdateBatcher(enabled=True, flush_interval=0.01, session_factory=session_factory)
+    
+    commits = []
+    def count_commit(conn):
+        commits.append(conn)
+    event.listen(engine, "commit", count_commit)
+    
+    async def send_updates():
+        return await asyncio.gather(
+            batcher.submit(first_id, {"quantity": 9}),
+            batcher.submit(second_id, {"quantity": 19}),
+            batcher.submit(first_id, {"quantity": 8}),
+            batcher.submit(first_id, {"memo": "restocked"}),
+        )
+    
+    try:
+        results = asyncio.run(send_updates())
+    finally:
+        event.remove(engine, "commit", count_commit)
+    
+    assert len(commits) == 1
+    assert [item.id for item in results] == [first_id, second_id, first_id, first_id]
+    first = client.get(f"/items/{first_id}").json()
+    assert first["quantity"] == 8
+    assert first["memo"] == "restocked"
+    assert client.get(f"/items/{second_id}").json()["quantity"] == 19
+
+def test_flush_when_batch_is_full(client, session_factory, create_item):
+    """Test that reaching max_batch_size flushes without waiting for the timer"""
+    item_id = create_item("Item", 10)
+    batcher = ItemUpdateBatcher(enabled=True, flush_interval=60, max_batch_size=2, session_factory=session_factory)
+    
+    async def send_updates():
+        return await asyncio.wait_for(asyncio.gather(
+            batcher.submit(item_id, {"quantity": 1}),
+            batcher.submit(item_id, {"quantity": 2}),
+        ), timeout=5)
+    
+    asyncio.run(send_updates())
+    assert client.get(f"/items/{item_id}").json()["quantity"] == 2
+
+def test_update_item_batched_endpoint(monkeypatch, client, session_factory, create_item):
+    """Test PUT /items/{id} through the write-behind batcher"""
+    monkeypatch.setattr(item_update_batcher, "enabled", True)
+    monkeypatch.setattr(item_update_batcher, "session_factory", session_factory)
+    item_id = create_item("Item", 10)
+    
+    response = client.put(f"/items/{item_id}", json={"quantity": 3})
+    assert response.status_code == 200
+    assert response.json()["quantity"] == 3
+    assert response.json()["name"] == "Item"
+    
+    response = client.put("/items/999", json={"quantity": 3})
+    assert response.status_code == 404
+
+def test_failing_update_only_fails_its_caller(client, session_factory, create_item):
+    """Test that an update rejected by the database does not roll back the others"""
+    first_id = create_item("First", 10)
+    second_id = create_item("Second", 20)
+    batcher = ItemUpdateBatcher(enabled=True, flush_interval=0.01, session_factory=session_factory)
+    
+    async def send_updates():
+        return await asyncio.gather(
+            batcher.submit(first_id, {"quantity": 5}),
+            batcher.submit(second_id, {"quantity": 15}),
+            batcher.submit(second_id, {"name": None}),
+            batcher.submit(second_id, {"memo": "checked"}),
+            return_exceptions=True
+        )
+    
+    first, second, bad, third = asyncio.run(send_updates())
+    assert first.quantity == 5
+    assert isinstance(bad, IntegrityError)
+    assert second.id == third.id == second_id
+    
+    assert client.get(f"/items/{first_id}").json()["quantity"] == 5
+    data = client.get(f"/items/{second_id}").json()
+    assert data["name"] == "Second"
+    assert data["quantity"] == 15
+    assert data["memo"] == "checked"
+
+
+def test_rows_are_updated_in_id_order(client, engine, session_factory, create_item):
+    """Test that a batch writes rows in ascending id order regardless of arrival"""
+    first_id = create_item("First", 10)
+    second_id = create_item("Second", 20)
+    batcher = ItemUpdateBatcher(enabled=True, flush_interval=0.01, session_factory=session_factory)
+    
+    updated = []
+    def record_update(conn, cursor, statement, parameters, context, executemany):
+        if statement.startswith("UPDATE items"):
+            updated.append(parameters[-1])
+    event.listen(engine, "before_cursor_execute", record_update)
+    
+    async def send_updates():
+        return await asyncio.gather(
+            batcher.submit(second_id, {"quantity": 1}),
+            batcher.submit(first_id, {"quantity": 2}),
+        )
+    
+    try:
+        asyncio.run(send_updates())
+    finally:
+        event.remove(engine, "before_cursor_execute", record_update)
+    assert updated == [first_id, second_id]
+
+def test_deadlocked_batch_is_retried(monkeypatch, client, session_factory, create_item):
+    """Test that a batch failing with a deadlock is retried once"""
+    item_id = create_item("Item", 10)
+    batcher = ItemUpdateBatcher(enabled=True, flush_interval=0.01, session_factory=session_factory)
+    real_update_items = crud_item.update_items
+    calls = []
+    def deadlock_once(db, updates):
+        calls.append(updates)
+        if len(calls) == 1:
+            raise OperationalError("UPDATE items", {}, Exception(1213, "Deadlock found"))
+        return real_update_items(db, updates)
+    monkeypatch.setattr(crud_item, "update_items", deadlock_once)
+    
+    async def send_update():
+        return await batcher.submit(item_id, {"quantity": 3})
+    
+    assert asyncio.run(send_update()).quantity == 3
+    assert len(calls) == 2